@@ -9,6 +9,7 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
+from string import Template
 from typing import Any, Dict, List
 
 import panel as pn
@@ -22,18 +23,26 @@ except Exception:  # pragma: no cover - compatibility
     CodeEditor = None
 
 
-def load_datasets(config_path: Path) -> tuple[List[Dict[str, Any]], str | None]:
-    """Load dataset definitions; return (datasets, error_message)."""
-    if not config_path.exists():
-        return [], f"Config file not found at {config_path}"
+@pn.cache(max_items=8)
+def _parse_config(path: str, mtime_ns: int, size: int) -> tuple[tuple[Dict[str, Any], ...], str | None]:
+    """Parse a config file; cached process-wide, keyed on (path, mtime, size)."""
     try:
-        data = json.loads(config_path.read_text())
+        data = json.loads(Path(path).read_text())
         datasets = data.get("datasets", [])
         if not isinstance(datasets, list):
-            return [], "Config file is missing a top-level 'datasets' list."
-        return datasets, None
+            return (), "Config file is missing a top-level 'datasets' list."
+        return tuple(datasets), None
     except Exception as exc:  # pragma: no cover - defensive
-        return [], f"Failed to parse config: {exc}"
+        return (), f"Failed to parse config: {exc}"
+
+
+def load_datasets(config_path: Path) -> tuple[List[Dict[str, Any]], str | None]:
+    """Load dataset definitions; return (datasets, error_message)."""
+    if not config_path.exists():
+        return [], f"Config file not found at {config_path}"
+    stat = config_path.stat()
+    datasets, error = _parse_config(str(config_path), stat.st_mtime_ns, stat.st_size)
+    return list(datasets), error
 
 
 DEFAULT_CONFIG = (
@@ -103,21 +112,14 @@ def set_code(pane: Any, text: str) -> None:
         pane.object = f"```python\n{text}\n```"
 
 
-def build_code_snippet(ds: Dict[str, Any]) -> str:
-    """Construct a small Python snippet to read a downsampled brick."""
-    raw_idx_url = ds.get("idx_url", "<idx_url>")
-    face = face_select.value
-    idx_url = raw_idx_url.format(face=face) if "{face}" in raw_idx_url else raw_idx_url
-    field = field_select.value or (ds.get("fields", [])[:1] or ["<field>"])[0]
-    time = time_input.value
-    res_drop = res_drop_input.value
+# Snippet bodies are fixed; only a handful of scalars change per widget event.
+READ_SNIPPET = Template(
+    """import OpenVisus as ov
 
-    return f"""import OpenVisus as ov
-
-idx_url = "{idx_url}"
-field = "{field}"
-time = {time}
-resolution_drop = {res_drop}  # larger drop = coarser read (safer for big datasets)
+idx_url = "$idx_url"
+field = "$field"
+time = $time
+resolution_drop = $res_drop  # larger drop = coarser read (safer for big datasets)
 
 ds = ov.LoadDataset(idx_url)
 
@@ -127,32 +129,21 @@ data = ds.read(time=time, field=field, quality=quality)
 
 print("shape:", getattr(data, "shape", None), "dtype:", getattr(data, "dtype", None))
 """
+)
 
-
-def build_derived_snippet(ds: Dict[str, Any]) -> str:
-    """Construct a helper snippet for common Task 1 derived fields."""
-    raw_idx_url = ds.get("idx_url", "<idx_url>")
-    face = face_select.value
-    idx_url = raw_idx_url.format(face=face) if "{face}" in raw_idx_url else raw_idx_url
-    fields = ds.get("fields", [])
-    field_u = "U" if "U" in fields else (fields[0] if fields else "<U_field>")
-    field_v = "V" if "V" in fields else (fields[1] if len(fields) > 1 else "<V_field>")
-    field_w = "W" if "W" in fields else "<W_field>"
-    time = time_input.value
-    res_drop = res_drop_input.value
-
-    return f"""import numpy as np
+DERIVED_SNIPPET = Template(
+    """import numpy as np
 import OpenVisus as ov
 
-idx_url = "{idx_url}"
-time = {time}
-resolution_drop = {res_drop}
+idx_url = "$idx_url"
+time = $time
+resolution_drop = $res_drop
 
 ds = ov.LoadDataset(idx_url)
 quality = -resolution_drop  # negative = coarser
-u = ds.read(field="{field_u}", time=time, quality=quality)
-v = ds.read(field="{field_v}", time=time, quality=quality)
-w = ds.read(field="{field_w}", time=time, quality=quality)
+u = ds.read(field="$field_u", time=time, quality=quality)
+v = ds.read(field="$field_v", time=time, quality=quality)
+w = ds.read(field="$field_w", time=time, quality=quality)
 
 speed = np.sqrt(u**2 + v**2)
 # Simple central differences for vorticity/divergence (replace with cube-aware stencils as needed).
@@ -163,53 +154,117 @@ divergence = du_dy + dv_dx
 
 print("speed range", float(speed.min()), float(speed.max()))
 """
+)
 
 
-def update_ui(event=None) -> None:
-    ds = current_dataset()
-    fields = ds.get("fields", [])
-    if fields:
-        field_select.options = fields
-        if field_select.value not in fields:
-            field_select.value = fields[0]
-    else:
-        field_select.options = []
-        field_select.value = None
+def build_code_snippet(ds: Dict[str, Any]) -> str:
+    """Construct a small Python snippet to read a downsampled brick."""
+    raw_idx_url = ds.get("idx_url", "<idx_url>")
+    face = face_select.value
+    idx_url = raw_idx_url.format(face=face) if "{face}" in raw_idx_url else raw_idx_url
+    field = field_select.value or (ds.get("fields", [])[:1] or ["<field>"])[0]
+    time = time_input.value
+    res_drop = res_drop_input.value
 
-    time_input.value = int(ds.get("default_time", time_input.value))
-    res_drop_input.value = int(
-        ds.get("default_resolution_drop", res_drop_input.value)
-    )
-    face_select.value = int(ds.get("default_face", face_select.value))
+    return READ_SNIPPET.substitute(idx_url=idx_url, field=field, time=time, res_drop=res_drop)
 
-    raw_idx_url = ds.get("idx_url", "")
-    face_select.disabled = "{face}" not in raw_idx_url
 
-    description = ds.get("description", "No description provided.")
-    raw_idx_url = ds.get("idx_url", "N/A")
-    idx_url = raw_idx_url.format(face=face_select.value) if "{face}" in raw_idx_url else raw_idx_url
+def build_derived_snippet(ds: Dict[str, Any]) -> str:
+    """Construct a helper snippet for common Task 1 derived fields."""
+    raw_idx_url = ds.get("idx_url", "<idx_url>")
+    face = face_select.value
+    idx_url = raw_idx_url.format(face=face) if "{face}" in raw_idx_url else raw_idx_url
+    fields = ds.get("fields", [])
+    field_u = "U" if "U" in fields else (fields[0] if fields else "<U_field>")
+    field_v = "V" if "V" in fields else (fields[1] if len(fields) > 1 else "<V_field>")
+    field_w = "W" if "W" in fields else "<W_field>"
+    time = time_input.value
+    res_drop = res_drop_input.value
 
-    details_lines = [
-        f"**Config file:** `{DEFAULT_CONFIG}`",
-        f"**IDX URL:** `{idx_url}`",
-        f"**Face selector:** {'active (applies ' + str(face_select.value) + ')' if '{face}' in raw_idx_url else 'n/a (idx_url has no {face} placeholder)'}",
-        f"**Fields:** {', '.join(fields) if fields else 'not specified'}",
-        f"**Default time:** {ds.get('default_time', 0)}",
-        f"**Default resolution drop:** {ds.get('default_resolution_drop', 4)}",
-        "",
-        description,
-    ]
-    if load_error:
-        details_lines.append(f"\n**Config warning:** {load_error}")
+    return DERIVED_SNIPPET.substitute(
+        idx_url=idx_url,
+        time=time,
+        res_drop=res_drop,
+        field_u=field_u,
+        field_v=field_v,
+        field_w=field_w,
+    )
 
-    details_md.object = "\n".join(details_lines)
-    set_code(code_openvisus_pane, build_code_snippet(ds))
-    set_code(code_derived_pane, build_derived_snippet(ds))
+
+def update_ui(event=None) -> None:
+    # Collect every widget/pane change below into a single document update for the browser.
+    with pn.io.hold():
+        ds = current_dataset()
+        fields = ds.get("fields", [])
+        if fields:
+            field_select.options = fields
+            if field_select.value not in fields:
+                field_select.value = fields[0]
+        else:
+            field_select.options = []
+            field_select.value = None
+
+        time_input.value = int(ds.get("default_time", time_input.value))
+        res_drop_input.value = int(
+            ds.get("default_resolution_drop", res_drop_input.value)
+        )
+        face_select.value = int(ds.get("default_face", face_select.value))
+
+        raw_idx_url = ds.get("idx_url", "")
+        face_select.disabled = "{face}" not in raw_idx_url
+
+        description = ds.get("description", "No description provided.")
+        raw_idx_url = ds.get("idx_url", "N/A")
+        idx_url = raw_idx_url.format(face=face_select.value) if "{face}" in raw_idx_url else raw_idx_url
+
+        details_lines = [
+            f"**Config file:** `{DEFAULT_CONFIG}`",
+            f"**IDX URL:** `{idx_url}`",
+            f"**Face selector:** {'active (applies ' + str(face_select.value) + ')' if '{face}' in raw_idx_url else 'n/a (idx_url has no {face} placeholder)'}",
+            f"**Fields:** {', '.join(fields) if fields else 'not specified'}",
+            f"**Default time:** {ds.get('default_time', 0)}",
+            f"**Default resolution drop:** {ds.get('default_resolution_drop', 4)}",
+            "",
+            description,
+        ]
+        if load_error:
+            details_lines.append(f"\n**Config warning:** {load_error}")
+
+        details_md.object = "\n".join(details_lines)
+
+    # The widget assignments above already queued a rebuild via their watchers; this covers the case
+    # where none of them changed value, and the pending flag folds it into that same single refresh.
+    trigger_update()
+
+
+# Widget events arriving within this window (held IntInput arrows, slider drags) share one snippet rebuild.
+SNIPPET_DEBOUNCE_MS = 150
+_snippet_refresh_pending = False
+
+
+def refresh_snippets() -> None:
+    global _snippet_refresh_pending
+    _snippet_refresh_pending = False
+    ds = current_dataset()
+    with pn.io.hold():
+        set_code(code_openvisus_pane, build_code_snippet(ds))
+        set_code(code_derived_pane, build_derived_snippet(ds))
 
 
 def trigger_update(event=None) -> None:
-    set_code(code_openvisus_pane, build_code_snippet(current_dataset()))
-    set_code(code_derived_pane, build_derived_snippet(current_dataset()))
+    """Schedule a snippet rebuild, coalescing bursts of widget events into one."""
+    global _snippet_refresh_pending
+    doc = pn.state.curdoc
+    if doc is None or doc.session_context is None:
+        # Not running under `panel serve` (e.g. imported in a notebook): refresh inline.
+        refresh_snippets()
+        return
+    if _snippet_refresh_pending:
+        return
+    _snippet_refresh_pending = True
+    # A one-shot Panel periodic callback (rather than a raw Bokeh timeout) runs with the session
+    # context set up, so the pn.io.hold() in refresh_snippets batches both pane updates.
+    pn.state.add_periodic_callback(refresh_snippets, period=SNIPPET_DEBOUNCE_MS, count=1)
 
 
 dataset_select.param.watch(update_ui, "value")
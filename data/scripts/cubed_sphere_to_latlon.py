@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 """Cubed-sphere to lat/lon wind sampler for SciVis 2026."""
 import argparse
+import functools
+import hashlib
 import json
 import logging
-import math
 import pathlib
+from collections import OrderedDict
 from typing import Iterable, Optional, Sequence, Tuple, Union
 
 import numpy as np
@@ -18,6 +20,19 @@ except Exception:  # pragma: no cover - fallback path
 
 ArrayLike = Union[np.ndarray, xr.DataArray]
 
+# Memory budget for one (query chunk, n_valid) block of dot products in the brute-force fallback.
+_BRUTE_FORCE_BLOCK_BYTES = 64 * 1024 * 1024
+
+# KD-trees keyed by a digest of the sample positions, so repeated conversions on one cube grid
+# (e.g. several levels or time steps in one process) build the tree only once.
+_TREE_CACHE: "OrderedDict[tuple, object]" = OrderedDict()
+_TREE_CACHE_SIZE = 4
+
+# run_levels reads the requested levels in one go once a batch is larger than this...
+_PRELOAD_MIN_LEVELS = 4
+# ...as long as the dataset block for all of them fits in this budget.
+_PRELOAD_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
 
 def _latlon_to_unit(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
     lat_r = np.deg2rad(lat)
@@ -28,6 +43,22 @@ def _latlon_to_unit(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
     return np.stack((x, y, z), axis=-1)
 
 
+@functools.lru_cache(maxsize=4)
+def _query_grid(lon: Tuple[float, ...], lat: Tuple[float, ...]) -> np.ndarray:
+    """Unit vectors of the (lat, lon) target grid, flattened row-major; cached across conversions."""
+    lat_r = np.deg2rad(np.asarray(lat, dtype=np.float64))
+    lon_r = np.deg2rad(np.asarray(lon, dtype=np.float64))
+    # Trig on the 1-D axes only, then an outer product, instead of per grid point.
+    cos_lat = np.cos(lat_r)[:, None]
+    xyz = np.empty((lat_r.size, lon_r.size, 3), dtype=np.float64)
+    xyz[..., 0] = cos_lat * np.cos(lon_r)[None, :]
+    xyz[..., 1] = cos_lat * np.sin(lon_r)[None, :]
+    xyz[..., 2] = np.sin(lat_r)[:, None]
+    xyz = xyz.reshape(-1, 3)
+    xyz.setflags(write=False)
+    return xyz
+
+
 def _infer_dim(name_candidates: Sequence[str], ds: xr.Dataset) -> Optional[str]:
     for cand in name_candidates:
         if cand in ds.dims or cand in ds.coords:
@@ -66,76 +97,76 @@ def _extract_time_level(ds: xr.Dataset, time_sel=None, level_sel=None) -> Tuple[
     return ds, time_value, level_value
 
 
+# Per-face (x, y, z) construction: which source each axis takes (0 = constant 1, 1 = a, 2 = b) and its sign.
+_FACE_AXIS_SOURCE = np.array(
+    [
+        [0, 1, 2],
+        [0, 1, 2],
+        [1, 0, 2],
+        [1, 0, 2],
+        [1, 2, 0],
+        [1, 2, 0],
+    ],
+    dtype=np.intp,
+)
+_FACE_AXIS_SIGN = np.array(
+    [
+        [1.0, 1.0, 1.0],
+        [-1.0, -1.0, 1.0],
+        [1.0, 1.0, 1.0],
+        [-1.0, -1.0, 1.0],
+        [1.0, 1.0, 1.0],
+        [1.0, -1.0, -1.0],
+    ],
+    dtype=np.float64,
+)
+
+
 def _cube_face_ij_to_latlon(face_ids: np.ndarray, i: np.ndarray, j: np.ndarray, nx: int, ny: int) -> Tuple[np.ndarray, np.ndarray]:
     # Normalize i,j to [-1, 1]
     a = (2.0 * (i / max(nx - 1, 1))) - 1.0
     b = (2.0 * (j / max(ny - 1, 1))) - 1.0
 
-    x = np.zeros_like(a, dtype=np.float64)
-    y = np.zeros_like(a, dtype=np.float64)
-    z = np.zeros_like(a, dtype=np.float64)
-
-    faces = face_ids.astype(np.int64)
-    x[faces == 0] = 1.0
-    y[faces == 0] = a[faces == 0]
-    z[faces == 0] = b[faces == 0]
-
-    x[faces == 1] = -1.0
-    y[faces == 1] = -a[faces == 1]
-    z[faces == 1] = b[faces == 1]
-
-    x[faces == 2] = a[faces == 2]
-    y[faces == 2] = 1.0
-    z[faces == 2] = b[faces == 2]
-
-    x[faces == 3] = -a[faces == 3]
-    y[faces == 3] = -1.0
-    z[faces == 3] = b[faces == 3]
-
-    x[faces == 4] = a[faces == 4]
-    y[faces == 4] = b[faces == 4]
-    z[faces == 4] = 1.0
+    # One gather per axis through the face tables instead of six masked writes per axis.
+    faces = face_ids.astype(np.intp)
+    source = _FACE_AXIS_SOURCE[faces]
+    sign = _FACE_AXIS_SIGN[faces]
+    x = sign[..., 0] * np.choose(source[..., 0], (1.0, a, b))
+    y = sign[..., 1] * np.choose(source[..., 1], (1.0, a, b))
+    z = sign[..., 2] * np.choose(source[..., 2], (1.0, a, b))
+
+    # arctan2 is scale-invariant, so the gnomonic vector never needs normalizing.
+    lat = np.rad2deg(np.arctan2(z, np.hypot(x, y)))
+    lon = np.rad2deg(np.arctan2(y, x))
+    return lat, lon
 
-    x[faces == 5] = a[faces == 5]
-    y[faces == 5] = -b[faces == 5]
-    z[faces == 5] = -1.0
 
-    vec = np.stack((x, y, z), axis=-1)
-    norm = np.linalg.norm(vec, axis=-1, keepdims=True)
-    norm[norm == 0] = 1.0
-    vec = vec / norm
+_LAT_NAMES = ["lat", "latitude", "Lat", "LAT", "geolat"]
+_LON_NAMES = ["lon", "longitude", "Lon", "LON", "geolon"]
 
-    lat = np.rad2deg(np.arcsin(vec[..., 2]))
-    lon = np.rad2deg(np.arctan2(vec[..., 1], vec[..., 0]))
-    return lat, lon
 
-
-def _extract_lat_lon(ds: xr.Dataset, x_dim: str, y_dim: str, face_dim: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
-    lat_name = _infer_dim(["lat", "latitude", "Lat", "LAT", "geolat"], ds)
-    lon_name = _infer_dim(["lon", "longitude", "Lon", "LON", "geolon"], ds)
+def _explicit_lat_lon(ds: xr.Dataset) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    lat_name = _infer_dim(_LAT_NAMES, ds)
+    lon_name = _infer_dim(_LON_NAMES, ds)
 
     if lat_name and lon_name and lat_name in ds and lon_name in ds:
-        lat = np.asarray(ds[lat_name].values)
-        lon = np.asarray(ds[lon_name].values)
+        lat = np.asarray(ds[lat_name].values, dtype=np.float64)
+        lon = np.asarray(ds[lon_name].values, dtype=np.float64)
         return lat, lon
+    return None
 
-    logging.info("Lat/lon arrays missing; using analytic cubed-sphere geometry (gnomonic, X-forward face order).")
 
-    shape = ds[x_dim].shape if x_dim in ds.dims else ds[list(ds.dims)[-1]].shape
-    nx = ds.dims[x_dim]
-    ny = ds.dims[y_dim]
-    face_size = ds.dims.get(face_dim, 1) if face_dim else 1
+def _analytic_lat_lon_at(flat_idx: np.ndarray, shape: Tuple[int, ...], has_face: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Analytic cubed-sphere lat/lon for flat indices into a (face, y, x) or (y, x) cube."""
+    logging.info("Lat/lon arrays missing; using analytic cubed-sphere geometry (gnomonic, X-forward face order).")
 
-    jj, ii = np.meshgrid(np.arange(ny), np.arange(nx), indexing="ij")
-    if face_dim:
-        face_ids = np.arange(face_size)[:, None, None] * np.ones_like(ii)[None, ...]
-        ii = np.broadcast_to(ii, (face_size,) + ii.shape)
-        jj = np.broadcast_to(jj, (face_size,) + jj.shape)
+    if has_face:
+        face_ids, jj, ii = np.unravel_index(flat_idx, shape)
     else:
+        jj, ii = np.unravel_index(flat_idx, shape)
         face_ids = np.zeros_like(ii)
-
-    lat, lon = _cube_face_ij_to_latlon(face_ids, ii, jj, nx, ny)
-    return lat, lon
+    ny, nx = shape[-2:]
+    return _cube_face_ij_to_latlon(face_ids, ii, jj, nx, ny)
 
 
 def _detect_dims(da: xr.DataArray) -> Tuple[Optional[str], str, str]:
@@ -155,7 +186,8 @@ def _load_inputs(inputs: Union[str, pathlib.Path, Sequence[Union[str, pathlib.Pa
     datasets = []
     for idx, path in enumerate(inputs):
         logging.info("Opening %s", path)
-        ds = xr.open_dataset(path)
+        # Lazy dask-backed variables: coarsening and masking run blockwise before anything is materialized.
+        ds = xr.open_dataset(path, chunks="auto")
         datasets.append(ds)
 
     if len(datasets) == 1:
@@ -167,7 +199,17 @@ def _load_inputs(inputs: Union[str, pathlib.Path, Sequence[Union[str, pathlib.Pa
             expanded.append(ds)
         else:
             expanded.append(ds.assign_coords(face=idx).expand_dims("face"))
-    combined = xr.concat(expanded, dim="face")
+    # Faces share the same y/x index, so skip alignment (join="override"). Non-index coords such as
+    # per-face 2-D lat/lon still differ between files and must be concatenated along face, which
+    # coords="different" does after comparing them (cheap next to the data variables).
+    combined = xr.concat(
+        expanded,
+        dim="face",
+        data_vars="minimal",
+        coords="different",
+        compat="equals",
+        join="override",
+    )
     return combined
 
 
@@ -175,47 +217,66 @@ def _maybe_coarsen(ds: xr.Dataset, y_dim: str, x_dim: str, factor: Optional[int]
     if not factor or factor <= 1:
         return ds
     logging.info("Coarsening cube by factor %s along (%s, %s)", factor, y_dim, x_dim)
-    return ds.coarsen({y_dim: factor, x_dim: factor}, boundary="trim").mean()
+    # One short-circuiting isnull().any() is cheaper than nanmean's per-window NaN bookkeeping,
+    # so only pay for skipna when a variable actually contains gaps.
+    has_nan = any(bool(ds[name].isnull().any()) for name in ds.data_vars)
+    reducer = np.nanmean if has_nan else np.mean
+    return ds.coarsen({y_dim: factor, x_dim: factor}, boundary="trim").reduce(reducer)
 
 
 def _build_tree(xyz: np.ndarray):
     if cKDTree is None:
         return None
+    xyz = np.ascontiguousarray(xyz)
+    key = (xyz.shape, xyz.dtype.str, hashlib.blake2b(xyz.data, digest_size=16).digest())
+    tree = _TREE_CACHE.get(key)
+    if tree is not None:
+        _TREE_CACHE.move_to_end(key)
+        logging.info("Reusing cached cKDTree for nearest-neighbor search")
+        return tree
     logging.info("Using cKDTree for nearest-neighbor search")
-    return cKDTree(xyz)
+    tree = cKDTree(xyz)
+    _TREE_CACHE[key] = tree
+    if len(_TREE_CACHE) > _TREE_CACHE_SIZE:
+        _TREE_CACHE.popitem(last=False)
+    return tree
 
 
 def _nearest_indices(valid_xyz: np.ndarray, query_xyz: np.ndarray) -> np.ndarray:
     tree = _build_tree(valid_xyz)
     if tree is not None:
-        _, idx = tree.query(query_xyz, k=1)
+        _, idx = tree.query(query_xyz, k=1, workers=-1)
         return idx.astype(np.int64)
 
     logging.info("cKDTree unavailable; falling back to chunked brute-force search")
-    idx = np.empty(query_xyz.shape[0], dtype=np.int64)
-    chunk = 64
-    valid_xyz_t = valid_xyz.T.astype(np.float32, copy=False)
-    for start in range(0, query_xyz.shape[0], chunk):
-        end = min(query_xyz.shape[0], start + chunk)
-        chunk_xyz = query_xyz[start:end].astype(np.float32, copy=False)
-        dots = valid_xyz_t.T @ chunk_xyz.T  # (n_valid, chunk)
-        idx[start:end] = np.argmax(dots, axis=0)
-    return idx
+    n_query = query_xyz.shape[0]
+    idx = np.empty(n_query, dtype=np.intp)
+    # SoA float32 copy of the samples: three contiguous x/y/z rows, half the bytes of the (N, 3) float64 input.
+    valid_soa = np.ascontiguousarray(valid_xyz.T, dtype=np.float32)
+    n_valid = valid_soa.shape[1]
+    # Size query chunks to a fixed score-block budget and reuse that block for every chunk.
+    chunk = max(1, min(n_query, _BRUTE_FORCE_BLOCK_BYTES // (4 * max(n_valid, 1))))
+    dots = np.empty((chunk, n_valid), dtype=np.float32)
+    for start in range(0, n_query, chunk):
+        end = min(n_query, start + chunk)
+        block = dots[: end - start]
+        np.matmul(query_xyz[start:end].astype(np.float32, copy=False), valid_soa, out=block)
+        np.argmax(block, axis=1, out=idx[start:end])
+    return idx.astype(np.int64, copy=False)
 
 
 def _to_serializable(arr: np.ndarray) -> list:
     arr32 = arr.astype(np.float32)
-    if np.isfinite(arr32).all():
+    finite = np.isfinite(arr32)
+    if finite.all():
         return arr32.tolist()
-    serializable = arr32.tolist()
-    for i, row in enumerate(serializable):
-        for j, val in enumerate(row):
-            if not math.isfinite(val):
-                serializable[i][j] = None
-    return serializable
+    # Object array of Python floats; blank the non-finite cells in one masked store instead of a per-cell loop.
+    serializable = arr32.astype(object)
+    serializable[~finite] = None
+    return serializable.tolist()
 
 
-def convert_cubed_sphere_to_latlon(
+def _sample_latlon(
     inputs: Union[str, pathlib.Path, Sequence[Union[str, pathlib.Path]]],
     target_lon: ArrayLike,
     target_lat: ArrayLike,
@@ -225,11 +286,34 @@ def convert_cubed_sphere_to_latlon(
     level_sel=None,
     method: str = "nearest",
     cube_coarsen: Optional[int] = None,
-) -> dict:
+) -> Tuple[dict, np.ndarray, np.ndarray]:
+    return _sample_dataset(
+        _load_inputs(inputs),
+        target_lon,
+        target_lat,
+        var_u=var_u,
+        var_v=var_v,
+        time_sel=time_sel,
+        level_sel=level_sel,
+        method=method,
+        cube_coarsen=cube_coarsen,
+    )
+
+
+def _sample_dataset(
+    ds: xr.Dataset,
+    target_lon: ArrayLike,
+    target_lat: ArrayLike,
+    var_u: str = "U",
+    var_v: str = "V",
+    time_sel=None,
+    level_sel=None,
+    method: str = "nearest",
+    cube_coarsen: Optional[int] = None,
+) -> Tuple[dict, np.ndarray, np.ndarray]:
     if method != "nearest":
         raise ValueError("Only nearest interpolation is implemented in this POC")
 
-    ds = _load_inputs(inputs)
     ds, time_value, level_value = _extract_time_level(ds, time_sel=time_sel, level_sel=level_sel)
 
     if var_u not in ds or var_v not in ds:
@@ -245,39 +329,41 @@ def convert_cubed_sphere_to_latlon(
             logging.info("Auto coarsen factor: %s", cube_coarsen)
     ds = _maybe_coarsen(ds, y_dim, x_dim, cube_coarsen)
 
-    lat_arr, lon_arr = _extract_lat_lon(ds, x_dim, y_dim, face_dim)
+    explicit_latlon = _explicit_lat_lon(ds)
 
-    u_cube = ds[var_u].astype(np.float64)
-    v_cube = ds[var_v].astype(np.float64)
+    # Winds are stored as float32 and the output is float32, so never widen the cube in between.
+    u_cube = ds[var_u].astype(np.float32, copy=False)
+    v_cube = ds[var_v].astype(np.float32, copy=False)
 
-    lat_arr = np.asarray(lat_arr, dtype=np.float64)
-    lon_arr = np.asarray(lon_arr, dtype=np.float64)
-
-    mask = (
-        np.isfinite(lat_arr)
-        & np.isfinite(lon_arr)
-        & np.isfinite(u_cube)
-        & np.isfinite(v_cube)
-    )
-    if not mask.any():
+    # Stack U/V once so the finite check and the gather each run as a single pass over the cube.
+    uv_cube = np.stack((u_cube.values, v_cube.values), axis=-1)
+    mask = np.isfinite(uv_cube).all(axis=-1)
+    if explicit_latlon is not None:
+        mask &= np.isfinite(explicit_latlon[0]) & np.isfinite(explicit_latlon[1])
+    valid = np.flatnonzero(mask)
+    if valid.size == 0:
         raise ValueError("No finite samples found after masking lat/lon/u/v")
 
-    lat_flat = lat_arr[mask]
-    lon_flat = lon_arr[mask]
-    u_flat = u_cube.values[mask]
-    v_flat = v_cube.values[mask]
+    if explicit_latlon is not None:
+        lat_flat = np.take(explicit_latlon[0], valid)
+        lon_flat = np.take(explicit_latlon[1], valid)
+    else:
+        # Analytic geometry is always finite, so evaluate it only where U/V are valid.
+        lat_flat, lon_flat = _analytic_lat_lon_at(valid, mask.shape, face_dim is not None)
+    uv_flat = np.take(uv_cube.reshape(-1, 2), valid, axis=0)
 
     valid_xyz = _latlon_to_unit(lat_flat, lon_flat).reshape(-1, 3)
 
-    lon_target = np.asarray(target_lon, dtype=np.float64)
-    lat_target = np.asarray(target_lat, dtype=np.float64)
-    lon_mesh, lat_mesh = np.meshgrid(lon_target, lat_target)
-    query_xyz = _latlon_to_unit(lat_mesh.ravel(), lon_mesh.ravel()).reshape(-1, 3)
+    lon_target = np.asarray(target_lon, dtype=np.float64).ravel()
+    lat_target = np.asarray(target_lat, dtype=np.float64).ravel()
+    query_xyz = _query_grid(tuple(lon_target.tolist()), tuple(lat_target.tolist()))
+    grid_shape = (lat_target.size, lon_target.size)
 
     nn_idx = _nearest_indices(valid_xyz, query_xyz)
 
-    u_out = u_flat[nn_idx].reshape(lat_mesh.shape)
-    v_out = v_flat[nn_idx].reshape(lat_mesh.shape)
+    uv_out = uv_flat[nn_idx].reshape(grid_shape + (2,))
+    u_out = uv_out[..., 0]
+    v_out = uv_out[..., 1]
 
     meta = {
         "time": None if time_value is None else str(time_value),
@@ -293,9 +379,34 @@ def convert_cubed_sphere_to_latlon(
             "lon": np.asarray(target_lon, dtype=np.float64).tolist(),
             "lat": np.asarray(target_lat, dtype=np.float64).tolist(),
         },
-        "shape": [int(lat_mesh.shape[0]), int(lat_mesh.shape[1])],
+        "shape": [int(grid_shape[0]), int(grid_shape[1])],
     }
 
+    return meta, u_out, v_out
+
+
+def convert_cubed_sphere_to_latlon(
+    inputs: Union[str, pathlib.Path, Sequence[Union[str, pathlib.Path]]],
+    target_lon: ArrayLike,
+    target_lat: ArrayLike,
+    var_u: str = "U",
+    var_v: str = "V",
+    time_sel=None,
+    level_sel=None,
+    method: str = "nearest",
+    cube_coarsen: Optional[int] = None,
+) -> dict:
+    meta, u_out, v_out = _sample_latlon(
+        inputs,
+        target_lon,
+        target_lat,
+        var_u=var_u,
+        var_v=var_v,
+        time_sel=time_sel,
+        level_sel=level_sel,
+        method=method,
+        cube_coarsen=cube_coarsen,
+    )
     return {
         "meta": meta,
         "u": _to_serializable(u_out),
@@ -303,13 +414,150 @@ def convert_cubed_sphere_to_latlon(
     }
 
 
-def _parse_args() -> argparse.Namespace:
+def _preload_levels(
+    ds: xr.Dataset, levels: Sequence, var_u: str, var_v: str, time_sel=None
+) -> Tuple[xr.Dataset, list, object]:
+    """Load all requested level indices with one read.
+
+    Returns the dataset, the levels remapped into it and the time selector to use on it.
+    """
+    levels = list(levels)
+    level_dim = _infer_dim(["lev", "level", "Levels", "height", "z"], ds)
+    if (
+        level_dim is None
+        or len(levels) <= _PRELOAD_MIN_LEVELS
+        or not all(isinstance(lvl, (int, np.integer)) for lvl in levels)
+        or var_u not in ds
+        or var_v not in ds
+    ):
+        return ds, levels, time_sel
+
+    # Only what the batch samples: U/V (plus lat/lon stored as data variables) at the requested time step.
+    block = ds[[var_u, var_v] + [name for name in _LAT_NAMES + _LON_NAMES if name in ds.data_vars]]
+    block_time_sel = time_sel
+    time_dim = _infer_dim(["time", "Time", "t"], block)
+    if time_sel is not None and time_dim in block.dims:
+        # Keep time as a length-1 dim so _extract_time_level still reports its value; index 0 selects it.
+        if isinstance(time_sel, (int, np.integer)):
+            block = block.isel({time_dim: [int(time_sel)]})
+        else:
+            block = block.sel({time_dim: [time_sel]}, method="nearest")
+        block_time_sel = 0
+
+    order = sorted({int(lvl) for lvl in levels})
+    # A contiguous run is one slice (a single strided read per chunk) rather than a fancy-indexed gather.
+    if order[-1] - order[0] + 1 == len(order):
+        indexer = slice(order[0], order[-1] + 1)
+    else:
+        indexer = order
+    block = block.isel({level_dim: indexer})
+    if block.nbytes > _PRELOAD_MAX_BYTES:
+        logging.info("Skipping level preload: %.1f MiB exceeds budget", block.nbytes / 2**20)
+        return ds, levels, time_sel
+
+    logging.info("Preloading %s levels along %s (%s)", len(order), level_dim, dict(block.sizes))
+    position = {lvl: k for k, lvl in enumerate(order)}
+    return block.load(), [position[int(lvl)] for lvl in levels], block_time_sel
+
+
+def run_levels(
+    inputs: Union[str, pathlib.Path, Sequence[Union[str, pathlib.Path]]],
+    levels: Sequence,
+    outputs: Sequence[Union[str, pathlib.Path]],
+    target_lon: ArrayLike,
+    target_lat: ArrayLike,
+    var_u: str = "U",
+    var_v: str = "V",
+    time_sel=None,
+    method: str = "nearest",
+    cube_coarsen: Optional[int] = None,
+) -> None:
+    """Sample each of `levels` from inputs opened once (lazily), writing levels[i] to outputs[i]."""
+    if len(levels) != len(outputs):
+        raise ValueError(f"Got {len(levels)} levels but {len(outputs)} output paths")
+    ds = _load_inputs(inputs)
+    ds, level_sels, time_sel = _preload_levels(ds, levels, var_u, var_v, time_sel)
+    for level, level_sel, output in zip(levels, level_sels, outputs):
+        meta, u_out, v_out = _sample_dataset(
+            ds,
+            target_lon,
+            target_lat,
+            var_u=var_u,
+            var_v=var_v,
+            time_sel=time_sel,
+            level_sel=level_sel,
+            method=method,
+            cube_coarsen=cube_coarsen,
+        )
+        _write_output(pathlib.Path(output), meta, u_out, v_out)
+        logging.info("Wrote level %s to %s", level, output)
+
+
+def _write_output(path: pathlib.Path, meta: dict, u_out: np.ndarray, v_out: np.ndarray) -> None:
+    """Write the sampled grid; the format follows the suffix (.nc, .npz, .bin, otherwise JSON)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+    u32 = u_out.astype(np.float32, copy=False)
+    v32 = v_out.astype(np.float32, copy=False)
+
+    if suffix == ".nc":
+        attrs = {"units": meta["units"], "method": meta["method"], "cube_shape": json.dumps(meta["cube_shape"])}
+        if meta["time"] is not None:
+            attrs["time"] = meta["time"]
+        if meta["level"] is not None:
+            attrs["level"] = meta["level"]
+        ds = xr.Dataset(
+            {"u": (("lat", "lon"), u32), "v": (("lat", "lon"), v32)},
+            coords={"lat": meta["grid"]["lat"], "lon": meta["grid"]["lon"]},
+            attrs=attrs,
+        )
+        encoding = {name: {"zlib": True, "complevel": 3} for name in ("u", "v")}
+        ds.to_netcdf(path, encoding=encoding)
+        return
+
+    if suffix == ".npz":
+        extra = {k: v for k, v in meta.items() if k != "grid"}
+        np.savez_compressed(
+            path,
+            u=u32,
+            v=v32,
+            lat=np.asarray(meta["grid"]["lat"]),
+            lon=np.asarray(meta["grid"]["lon"]),
+            meta=np.asarray(json.dumps(extra)),
+        )
+        return
+
+    if suffix == ".bin":
+        # Raw little-endian float32 U rows then V rows (NaN marks missing cells), described by a JSON sidecar.
+        np.stack((u32, v32)).astype("<f4", copy=False).tofile(path)
+        sidecar = {
+            "meta": meta,
+            "binary": {"file": path.name, "dtype": "<f4", "shape": meta["shape"], "fields": ["u", "v"]},
+        }
+        path.with_suffix(".json").write_text(json.dumps(sidecar, separators=(",", ":")), encoding="utf-8")
+        return
+
+    result = {"meta": meta, "u": _to_serializable(u32), "v": _to_serializable(v32)}
+    # json.dumps takes the C encoder fast path (json.dump to a file does not); compact separators trim the payload.
+    with path.open("w", encoding="utf-8") as f:
+        f.write(json.dumps(result, allow_nan=False, separators=(",", ":")))
+
+
+def _index_or_value(text: str):
+    """argparse type for --time/--level: plain integers are positional indices, anything else a coordinate value."""
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Convert cubed-sphere wind to lat/lon JSON")
     parser.add_argument("inputs", nargs="+", help="NetCDF/IDX paths (one per face or combined)")
     parser.add_argument("--var-u", default="U", help="Name of eastward wind variable")
     parser.add_argument("--var-v", default="V", help="Name of northward wind variable")
-    parser.add_argument("--time", dest="time_sel", help="Time index or timestamp")
-    parser.add_argument("--level", dest="level_sel", help="Vertical level index/value")
+    parser.add_argument("--time", dest="time_sel", type=_index_or_value, help="Time index or timestamp")
+    parser.add_argument("--level", dest="level_sel", type=_index_or_value, help="Vertical level index/value")
     parser.add_argument("--lon-res", type=int, default=360, help="Number of longitude samples (default: 360)")
     parser.add_argument("--lat-res", type=int, default=181, help="Number of latitude samples (default: 181)")
     parser.add_argument(
@@ -327,21 +575,22 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--output",
         default="data/samples/uv_small.json",
-        help="Output JSON path (default: data/samples/uv_small.json)",
+        help="Output path; .nc writes compressed NetCDF, .npz compressed NumPy, .bin raw float32 plus a "
+        "JSON sidecar, anything else JSON (default: data/samples/uv_small.json)",
     )
     parser.add_argument("-v", "--verbose", action="count", default=0, help="Increase log verbosity")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main():
-    args = _parse_args()
+def main(argv: Optional[Sequence[str]] = None):
+    args = _parse_args(argv)
     log_level = logging.WARNING - (10 * min(args.verbose, 2))
     logging.basicConfig(level=log_level, format="[%(levelname)s] %(message)s")
 
     target_lon = np.linspace(-180.0, 180.0, num=args.lon_res, endpoint=False)
     target_lat = np.linspace(-90.0, 90.0, num=args.lat_res)
 
-    result = convert_cubed_sphere_to_latlon(
+    meta, u_out, v_out = _sample_latlon(
         inputs=args.inputs,
         target_lon=target_lon,
         target_lat=target_lat,
@@ -354,21 +603,21 @@ def main():
     )
 
     output_path = pathlib.Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(result, f, allow_nan=False)
+    _write_output(output_path, meta, u_out, v_out)
+
+    # The min/max scans are a full pass per field; skip them unless INFO is on.
+    if not logging.getLogger().isEnabledFor(logging.INFO):
+        return
 
-    u_arr = np.asarray(result["u"], dtype=np.float32)
-    v_arr = np.asarray(result["v"], dtype=np.float32)
     logging.info(
         "Wrote %s with grid %sx%s; u[min,max]=%.3f..%.3f, v[min,max]=%.3f..%.3f",
         output_path,
-        result["meta"]["shape"][1],
-        result["meta"]["shape"][0],
-        np.nanmin(u_arr),
-        np.nanmax(u_arr),
-        np.nanmin(v_arr),
-        np.nanmax(v_arr),
+        meta["shape"][1],
+        meta["shape"][0],
+        np.nanmin(u_out),
+        np.nanmax(u_out),
+        np.nanmin(v_out),
+        np.nanmax(v_out),
     )
 
 
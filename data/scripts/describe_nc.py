@@ -9,7 +9,8 @@ import xarray as xr
 
 
 def summarize(path: pathlib.Path, vars_filter=None):
-    ds = xr.open_dataset(path)
+    # Dask-backed so the min/max reductions stream block by block instead of loading whole variables.
+    ds = xr.open_dataset(path, chunks="auto")
     print(f"\n=== {path} ===")
     print("dims:", dict(ds.dims))
     if ds.coords:
@@ -22,11 +23,10 @@ def summarize(path: pathlib.Path, vars_filter=None):
             print(f"  - {name}: not found")
             continue
         da = ds[name]
-        arr = np.asarray(da)
-        finite = arr[np.isfinite(arr)]
-        vmin = finite.min() if finite.size else np.nan
-        vmax = finite.max() if finite.size else np.nan
-        print(f"  - {name}: shape={arr.shape}, dims={da.dims}, min/max={vmin:.3f}/{vmax:.3f}")
+        # NaN-skipping reductions: one pass each, no compacted copy of the finite values.
+        vmin = float(da.min(skipna=True)) if da.size else np.nan
+        vmax = float(da.max(skipna=True)) if da.size else np.nan
+        print(f"  - {name}: shape={da.shape}, dims={da.dims}, min/max={vmin:.3f}/{vmax:.3f}")
     ds.close()
 
 
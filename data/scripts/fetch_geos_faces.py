@@ -1,4 +1,6 @@
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import xarray as xr
 import openvisuspy as ov
@@ -8,15 +10,21 @@ timestep = 0   # change if you want a different time
 level = 0      # vertical index 0..51 (52 levels)
 
 
-def read_face(var: str, face: int):
-    url = f"{base_url}/GEOS_{var.upper()}/{var}_face_{face}_depth_52_time_0_10269.idx"
-    ds = ov.LoadDataset(url)
+def face_url(var: str, face: int) -> str:
+    return f"{base_url}/GEOS_{var.upper()}/{var}_face_{face}_depth_52_time_0_10269.idx"
+
+
+def open_face(var: str, face: int):
+    ds = ov.LoadDataset(face_url(var, face))
+    return ds, ds.createAccess()
+
+
+def read_face(var: str, face: int, ds, access):
     nx, ny, nz = ds.getLogicSize()
     if level >= nz:
         raise ValueError(f"level {level} out of range 0..{nz-1}")
     logic_box = ([0, 0, level], [nx, ny, level + 1])  # full X/Y, one Z
     query = ds.createBoxQuery(timestep=timestep, field=ds.getField().name, logic_box=logic_box, full_dim=True)
-    access = ds.createAccess()
     ds.beginBoxQuery(query)
     last = None
     while ds.isQueryRunning(query):
@@ -26,18 +34,26 @@ def read_face(var: str, face: int):
         last = res["data"]
         ds.nextBoxQuery(query)
     if last is None:
-        raise RuntimeError(f"No data for {url}")
-    arr = np.squeeze(last)
+        raise RuntimeError(f"No data for {face_url(var, face)}")
+    # Only the final (finest) block is kept: rebinding `last` each pass already drops the coarser ones.
+    # Winds are plotted, not integrated: store float32 even if the server hands back float64.
+    arr = np.ascontiguousarray(np.squeeze(last), dtype=np.float32)
     print(f"{var} face {face}: shape {arr.shape}, min/max {arr.min():.3f}/{arr.max():.3f}")
     return arr
 
 
+keys = [(var, face) for face in range(6) for var in ("u", "v")]
+# Every (var, face) is its own remote dataset: open all 12 concurrently, keep each ds/access pair,
+# then overlap the 12 reads so wall time is bounded by the slowest request rather than their sum.
+print("Fetching U/V for faces 0-5…")
+with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+    handles = dict(zip(keys, pool.map(lambda key: open_face(*key), keys)))
+    futures = {key: pool.submit(read_face, *key, *handles[key]) for key in keys}
+    arrays = {key: fut.result() for key, fut in futures.items()}
+
 faces = []
 for face in range(6):
-    print(f"Fetching U face {face}…")
-    U = read_face("u", face)
-    print(f"Fetching V face {face}…")
-    V = read_face("v", face)
+    U, V = arrays[("u", face)], arrays[("v", face)]
     if U.shape != V.shape:
         raise RuntimeError(f"Shape mismatch on face {face}: U{U.shape} vs V{V.shape}")
     faces.append({"face": face, "U": U, "V": V})
@@ -56,5 +72,10 @@ for f in faces:
         attrs={"source": "DYAMOND GEOS", "timestep": int(timestep), "level": int(level)},
     )
     out_path = out_dir / f"uv_face{f['face']}.nc"
-    ds.to_netcdf(out_path)
+    # DEFLATE-1 with one chunk per face: the converter always reads whole faces, so a single chunk
+    # decompresses in one go while the files shrink to roughly a third.
+    encoding = {
+        name: {"zlib": True, "complevel": 1, "chunksizes": (1, ny, nx), "dtype": "float32"} for name in ("U", "V")
+    }
+    ds.to_netcdf(out_path, engine="netcdf4", encoding=encoding)
     print("wrote", out_path, ds["U"].shape)
@@ -1,4 +1,6 @@
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import xarray as xr
 import openvisuspy as ov
@@ -9,10 +11,23 @@ level = 0
 # For full-globe coverage, request the whole face but allow the server to downsample to this many pixels.
 MAX_PIXELS = 1_500_000
 WINDOW = 20_000  # bigger than domain; will be clamped to dataset size
+# Dataset path per variable, relative to base_url.
+VAR_PATHS = {
+    "u": "mit_output/llc2160_arco/visus.idx",
+    "v": "mit_output/llc2160_v/v_llc2160_x_y_depth.idx",
+    "w": "mit_output/llc2160_w/llc2160_w.idx",
+    "theta": "mit_output/llc2160_theta/llc2160_theta.idx",
+    "salt": "mit_output/llc2160_salt/salt_llc2160_x_y_depth.idx",
+}
 
 
-def read_slice(url: str, timestep: int, level: int):
+def open_var(var: str):
+    url = base_url + VAR_PATHS[var]
     ds = ov.LoadDataset(url)
+    return url, ds, ds.createAccess()
+
+
+def read_slice(ds, access, timestep: int, level: int):
     nx, ny, nz = ds.getLogicSize()
     if level < 0 or level >= nz:
         raise ValueError(f"level {level} out of range 0..{nz-1}")
@@ -29,7 +44,6 @@ def read_slice(url: str, timestep: int, level: int):
     )
     if query is None:
         raise RuntimeError("Failed to create query")
-    access = ds.createAccess()
     ds.beginBoxQuery(query)
     last_data = None
     while ds.isQueryRunning(query):
@@ -40,27 +54,26 @@ def read_slice(url: str, timestep: int, level: int):
         ds.nextBoxQuery(query)
     if last_data is None:
         raise RuntimeError("No data returned from query")
-    return np.squeeze(last_data)
+    # Only the final (finest) block is kept: rebinding `last_data` each pass already drops the coarser ones.
+    # Winds are plotted, not integrated: store float32 even if the server hands back float64.
+    return np.ascontiguousarray(np.squeeze(last_data), dtype=np.float32)
 
 
-def fetch_var(var: str):
-    if var in ("theta", "w"):
-        base_dir = f"mit_output/llc2160_{var}/llc2160_{var}.idx"
-    elif var == "u":
-        base_dir = "mit_output/llc2160_arco/visus.idx"
-    else:
-        base_dir = f"mit_output/llc2160_{var}/{var}_llc2160_x_y_depth.idx"
-    url = base_url + base_dir
+def fetch_var(var: str, handle):
+    url, ds, access = handle
     print(f"Reading {var} from {url} (timestep={timestep}, level={level})")
-    data = read_slice(url, timestep=timestep, level=level)
+    data = read_slice(ds, access, timestep=timestep, level=level)
     print(f"  shape {data.shape}, min/max {data.min():.3f}/{data.max():.3f}")
     return data
 
 
-print("Fetching U...")
-U = fetch_var("u")
-print("Fetching V...")
-V = fetch_var("v")
+print("Fetching U and V...")
+# Independent remote datasets: open both up front, then overlap the reads so wall time is max(U, V), not the sum.
+with ThreadPoolExecutor(max_workers=2) as pool:
+    handles = dict(zip(("u", "v"), pool.map(open_var, ("u", "v"))))
+    fut_u = pool.submit(fetch_var, "u", handles["u"])
+    fut_v = pool.submit(fetch_var, "v", handles["v"])
+    U, V = fut_u.result(), fut_v.result()
 
 if U.shape != V.shape:
     raise RuntimeError(f"Shape mismatch U{U.shape} vs V{V.shape}")
@@ -76,5 +89,7 @@ cube = xr.Dataset(
 )
 out_path = pathlib.Path("notebooks/uv_cube_t0_z0.nc")
 out_path.parent.mkdir(parents=True, exist_ok=True)
-cube.to_netcdf(out_path)
+# DEFLATE-1 with one chunk per face (the whole slice is always read at once); same layout as fetch_geos_faces.py.
+encoding = {name: {"zlib": True, "complevel": 1, "chunksizes": (1, ny, nx), "dtype": "float32"} for name in ("U", "V")}
+cube.to_netcdf(out_path, engine="netcdf4", encoding=encoding)
 print("Wrote", out_path, "shape", cube["U"].shape)
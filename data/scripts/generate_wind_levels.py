@@ -9,7 +9,8 @@ It can:
   the cubed-sphere inputs and set `--mode cubed-sphere`.
 
 Outputs:
-- web/public/data/wind/uv_level_XXX.json for each level
+- web/public/data/wind/uv_level_XXX.json for each level (with `--format f32`, a float32
+  uv_level_XXX.bin plus a uv_level_XXX.json sidecar pointing at it)
 - web/public/data/wind/levels.json manifest listing available levels
 
 Notes:
@@ -20,16 +21,32 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
+import logging
 import math
+import multiprocessing
+import os
 import pathlib
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Iterable, List, Sequence
 
+import numpy as np
+
+try:  # Optional; serializes NumPy arrays natively and much faster than the stdlib encoder
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - fallback path
+    orjson = None
 
 ROOT = pathlib.Path(__file__).resolve().parents[2]
 DEFAULT_OUT_DIR = ROOT / "web" / "public" / "data" / "wind"
+SCRIPTS_DIR = ROOT / "data" / "scripts"
+
+# data/scripts is not a package; make the sibling converter importable however this module is loaded.
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
 
 
 def _read_json(path: pathlib.Path) -> dict:
@@ -37,25 +54,76 @@ def _read_json(path: pathlib.Path) -> dict:
         return json.load(f)
 
 
+def _json_default(obj: Any) -> Any:
+    # stdlib fallback for the U/V arrays orjson would serialize directly (NaN -> null)
+    if isinstance(obj, np.ndarray):
+        return _field_to_list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    # Compact separators and one json.dumps call: json.dump with indent goes through the
+    # pure-Python iterencode path and roughly triples the size of the U/V grids.
+    return (json.dumps(obj, separators=(",", ":"), default=_json_default) + "\n").encode("utf-8")
+
+
 def _write_json(path: pathlib.Path, obj: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2)
-        f.write("\n")
-
-
-def _scale_field(field: list, scale: float) -> list:
-    # field is nested lists [j][i]; values can be None
-    out = []
-    for row in field:
-        out_row = []
-        for v in row:
-            if v is None:
-                out_row.append(None)
-            else:
-                out_row.append(float(v) * scale)
-        out.append(out_row)
-    return out
+    path.write_bytes(_dumps(obj))
+
+
+def _field_array(field: list) -> np.ndarray:
+    # field is nested lists [j][i]; values can be None, which NumPy decodes as NaN
+    return np.array(field, dtype=np.float64)
+
+
+def _field_to_list(arr: np.ndarray) -> list:
+    missing = np.isnan(arr)
+    if not missing.any():
+        return arr.tolist()
+    out = arr.astype(object)
+    out[missing] = None
+    return out.tolist()
+
+
+def _write_level_binary(out_dir: pathlib.Path, level: int, meta: dict, u: np.ndarray, v: np.ndarray) -> None:
+    # Same layout as cubed_sphere_to_latlon.py's .bin output: U rows then V rows as little-endian
+    # float32 (NaN = missing), plus a uv_level_XXX.json sidecar the web loader follows to the blob.
+    bin_path = out_dir / f"uv_level_{level:03d}.bin"
+    bin_path.parent.mkdir(parents=True, exist_ok=True)
+    np.stack((u, v)).astype("<f4").tofile(bin_path)
+    sidecar = {
+        "meta": meta,
+        "binary": {"file": bin_path.name, "dtype": "<f4", "shape": list(u.shape), "fields": ["u", "v"]},
+    }
+    _write_json(bin_path.with_suffix(".json"), sidecar)
+
+
+# Per-process copy of the parsed template, set once by the pool initializer so tasks only carry (level, scale).
+_PLACEHOLDER_STATE: dict = {}
+
+
+def _init_placeholder_worker(
+    u0: np.ndarray, v0: np.ndarray, meta_base: dict, out_dir: pathlib.Path, fmt: str
+) -> None:
+    _PLACEHOLDER_STATE.update(u0=u0, v0=v0, meta_base=meta_base, out_dir=out_dir, fmt=fmt)
+
+
+def _write_placeholder_level(task: tuple) -> int:
+    level, scale = task
+    state = _PLACEHOLDER_STATE
+    u = state["u0"] * scale
+    v = state["v0"] * scale
+    meta = {**state["meta_base"], "level": level}
+    if state["fmt"] == "f32":
+        _write_level_binary(state["out_dir"], level, meta, u, v)
+    else:
+        # Arrays go to the encoder as-is: orjson writes them natively, the stdlib path via _json_default.
+        out = {"meta": meta, "u": u, "v": v}
+        _write_json(state["out_dir"] / f"uv_level_{level:03d}.json", out)
+    return level
 
 
 def _placeholder_levels(
@@ -63,25 +131,26 @@ def _placeholder_levels(
     levels: Sequence[int],
     out_dir: pathlib.Path,
     scale_per_level: float,
+    fmt: str = "json",
+    workers: int | None = None,
 ) -> None:
-    manifest_levels: List[int] = []
-
-    for level in levels:
-        scale = 1.0 + scale_per_level * float(level)
-        out = {
-            "meta": {
-                **(template.get("meta", {}) or {}),
-                "level": int(level),
-            },
-            "u": _scale_field(template.get("u", []), scale),
-            "v": _scale_field(template.get("v", []), scale),
-        }
-
-        out_path = out_dir / f"uv_level_{level:03d}.json"
-        _write_json(out_path, out)
-        manifest_levels.append(int(level))
+    # Parse the template once; each level is then just a scaled copy of these arrays.
+    meta_base = template.get("meta", {}) or {}
+    u0 = _field_array(template.get("u", []))
+    v0 = _field_array(template.get("v", []))
+    init_args = (u0, v0, meta_base, out_dir, fmt)
+
+    tasks = [(int(level), 1.0 + scale_per_level * float(level)) for level in levels]
+    processes = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    if processes == 1:
+        _init_placeholder_worker(*init_args)
+        manifest_levels = [_write_placeholder_level(task) for task in tasks]
+    else:
+        # JSON encoding holds the GIL, so spread the levels over processes rather than threads.
+        with multiprocessing.Pool(processes, initializer=_init_placeholder_worker, initargs=init_args) as pool:
+            manifest_levels = pool.map(_write_placeholder_level, tasks)
 
-    _write_json(out_dir / "levels.json", {"levels": manifest_levels})
+    _write_json(out_dir / "levels.json", {"levels": manifest_levels, "format": fmt})
 
 
 def _cubed_sphere_levels(
@@ -95,14 +164,43 @@ def _cubed_sphere_levels(
     cube_coarsen: int | None,
     out_dir: pathlib.Path,
     verbose: bool,
+    fmt: str = "json",
+    workers: int | None = None,
+    use_subprocess: bool = False,
 ) -> None:
-    """Call existing converter once per level and write to out_dir."""
-
-    manifest_levels: List[int] = []
-    converter = ROOT / "data" / "scripts" / "cubed_sphere_to_latlon.py"
-
-    for level in levels:
-        out_path = out_dir / f"uv_level_{level:03d}.json"
+    """Call existing converter once per level and write to out_dir.
+
+    By default the converter runs in this process; `use_subprocess` restores the old one-child-per-level
+    behaviour (run `workers` at a time), which is handy for debugging a single level in isolation.
+    """
+
+    # The converter picks its writer from the suffix; .bin also writes the uv_level_XXX.json sidecar.
+    suffix = "bin" if fmt == "f32" else "json"
+    out_paths = {int(level): out_dir / f"uv_level_{level:03d}.{suffix}" for level in levels}
+
+    if not use_subprocess:
+        # One interpreter for the whole batch: the converter opens the inputs once and only slices
+        # each level; its query-grid and cKDTree caches also carry over between levels.
+        import cubed_sphere_to_latlon
+
+        cubed_sphere_to_latlon.run_levels(
+            inputs,
+            list(out_paths),
+            list(out_paths.values()),
+            target_lon=np.linspace(-180.0, 180.0, num=lon_res, endpoint=False),
+            target_lat=np.linspace(-90.0, 90.0, num=lat_res),
+            var_u=var_u,
+            var_v=var_v,
+            # Same rule as the converter CLI (--subprocess path): plain integers are positional indices.
+            time_sel=None if time_sel is None else cubed_sphere_to_latlon._index_or_value(time_sel),
+            cube_coarsen=cube_coarsen,
+        )
+        _write_json(out_dir / "levels.json", {"levels": sorted(out_paths), "format": fmt})
+        return
+
+    converter = SCRIPTS_DIR / "cubed_sphere_to_latlon.py"
+    cmds = {}
+    for level, out_path in out_paths.items():
         cmd: List[str] = [sys.executable, str(converter), *inputs]
         cmd += ["--var-u", var_u, "--var-v", var_v]
         cmd += ["--lon-res", str(lon_res), "--lat-res", str(lat_res)]
@@ -114,12 +212,67 @@ def _cubed_sphere_levels(
             cmd += ["--cube-coarsen", str(cube_coarsen)]
         if verbose:
             cmd += ["-v"]
+        cmds[level] = cmd
+
+    # Each level is an independent child process, so threads are enough to keep several running at once.
+    max_workers = max(1, min(workers or os.cpu_count() or 1, len(cmds)))
+    manifest_levels: List[int] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for level, cmd in cmds.items():
+            print("Running:", " ".join(cmd))
+            futures[pool.submit(subprocess.check_call, cmd)] = level
+        for future in as_completed(futures):
+            future.result()
+            manifest_levels.append(futures[future])
+
+    _write_json(out_dir / "levels.json", {"levels": sorted(manifest_levels), "format": fmt})
 
-        print("Running:", " ".join(cmd))
-        subprocess.check_call(cmd)
-        manifest_levels.append(int(level))
 
-    _write_json(out_dir / "levels.json", {"levels": manifest_levels})
+def _gzip_file(path: pathlib.Path) -> None:
+    # mtime=0 keeps the .gz byte-identical across reruns of the same data
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
+
+
+def _sync_gzip_outputs(out_dir: pathlib.Path, levels: Sequence[int], enabled: bool) -> None:
+    """Write (or, when disabled, delete) the precompressed .gz next to every generated file.
+
+    gzip_static-style servers prefer an existing .gz without comparing ages, so a leftover sibling
+    from an earlier --gzip run would keep shadowing freshly generated data.
+    """
+    paths = [out_dir / "levels.json"]
+    for level in levels:
+        paths += [p for p in out_dir.glob(f"uv_level_{level:03d}.*") if p.suffix in (".json", ".bin")]
+    if not enabled:
+        for path in paths:
+            path.with_name(path.name + ".gz").unlink(missing_ok=True)
+        return
+    # zlib releases the GIL, so threads compress the files in parallel.
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(_gzip_file, paths))
+
+
+def _parse_levels(spec: str) -> List[int]:
+    """Parse a --levels spec: comma-separated items, each a single level or an inclusive 'a-b' range."""
+    levels: List[int] = []
+    try:
+        for item in spec.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            a, sep, b = item.partition("-")
+            if sep:
+                start, stop = int(a), int(b)
+                if stop < start:
+                    raise argparse.ArgumentTypeError(f"empty level range {item!r}")
+                levels.extend(range(start, stop + 1))
+            else:
+                levels.append(int(item))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid level spec {spec!r}") from None
+    if not levels:
+        raise argparse.ArgumentTypeError("no levels given")
+    return levels
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -147,9 +300,24 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     ap.add_argument(
         "--levels",
-        type=str,
+        type=_parse_levels,
         default="0-50",
-        help="Levels to generate. Formats: '0-50' or '0,1,2,10'",
+        help="Levels to generate. Formats: '0-50', '0,1,2,10' or a mix such as '0-5,10'",
+    )
+
+    ap.add_argument(
+        "--format",
+        choices=["json", "f32"],
+        default="json",
+        help="json: U/V as nested lists; f32: raw float32 uv_level_XXX.bin plus a small JSON sidecar",
+    )
+
+    ap.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Also write a precompressed .gz next to each output file; URLs are unchanged, a server "
+        "with gzip_static-style lookup sends them with Content-Encoding: gzip. Without it, stale .gz "
+        "siblings of the written files are removed",
     )
 
     ap.add_argument(
@@ -172,25 +340,31 @@ def main(argv: Sequence[str] | None = None) -> int:
     ap.add_argument("--lon-res", type=int, default=360)
     ap.add_argument("--lat-res", type=int, default=181)
     ap.add_argument("--cube-coarsen", type=int, default=None)
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Levels to generate in parallel: worker processes in placeholder mode, converter "
+        "processes in cubed-sphere mode with --subprocess (default: CPU count)",
+    )
+    ap.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="(cubed-sphere mode) run the converter as a separate Python process per level instead of in-process",
+    )
     ap.add_argument("-v", "--verbose", action="store_true")
 
     ns = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if ns.verbose else logging.WARNING, format="[%(levelname)s] %(message)s")
 
     out_dir = pathlib.Path(ns.out_dir)
 
-    # parse levels
-    levels: List[int] = []
-    if "," in ns.levels:
-        levels = [int(x.strip()) for x in ns.levels.split(",") if x.strip()]
-    elif "-" in ns.levels:
-        a, b = ns.levels.split("-", 1)
-        levels = list(range(int(a), int(b) + 1))
-    else:
-        levels = [int(ns.levels)]
+    levels: List[int] = ns.levels
 
     if ns.mode == "placeholder":
         template = _read_json(pathlib.Path(ns.template_json))
-        _placeholder_levels(template, levels, out_dir, ns.scale_per_level)
+        _placeholder_levels(template, levels, out_dir, ns.scale_per_level, fmt=ns.format, workers=ns.workers)
+        _sync_gzip_outputs(out_dir, levels, ns.gzip)
         print(f"Wrote {len(levels)} placeholder levels to {out_dir}")
         return 0
 
@@ -209,7 +383,11 @@ def main(argv: Sequence[str] | None = None) -> int:
         cube_coarsen=ns.cube_coarsen,
         out_dir=out_dir,
         verbose=ns.verbose,
+        fmt=ns.format,
+        workers=ns.workers,
+        use_subprocess=ns.subprocess,
     )
+    _sync_gzip_outputs(out_dir, levels, ns.gzip)
     print(f"Wrote {len(levels)} levels to {out_dir}")
     return 0
 
@@ -103,14 +103,49 @@ async function loadWindLevel(level) {
     );
   }
 
+  let parsed;
   try {
-    return JSON.parse(text);
+    parsed = JSON.parse(text);
   } catch (e) {
     throw new Error(
       `Invalid JSON for wind level ${level} (${url})\n` +
       `Response (first 200 chars): ${text.slice(0, 200)}`
     );
   }
+  // `--format f32` levels: the JSON is only a sidecar pointing at a raw float32 blob.
+  return parsed?.binary ? loadBinaryWindLevel(parsed, level) : parsed;
+}
+
+async function loadBinaryWindLevel(sidecar, level) {
+  const { file, shape, fields = ['u', 'v'] } = sidecar.binary;
+  const padded = String(level).padStart(3, '0');
+  const url = `/data/wind/${file}?v=${padded}`;
+  const res = await fetch(url, { cache: 'no-store' });
+  if (!res.ok) {
+    throw new Error(`Failed to load wind level ${level}: ${res.status} ${res.statusText} (${url})`);
+  }
+  const values = new Float32Array(await res.arrayBuffer());
+  const [ny, nx] = shape;
+  if (values.length !== fields.length * ny * nx) {
+    throw new Error(`Unexpected size for wind level ${level} (${url}): ${values.length} values`);
+  }
+
+  // Rebuild the nested [lat][lon] arrays (NaN -> null) the wind components expect.
+  const data = { meta: sidecar.meta };
+  fields.forEach((name, k) => {
+    const rows = new Array(ny);
+    for (let j = 0; j < ny; j++) {
+      const base = (k * ny + j) * nx;
+      const row = new Array(nx);
+      for (let i = 0; i < nx; i++) {
+        const x = values[base + i];
+        row[i] = Number.isNaN(x) ? null : x;
+      }
+      rows[j] = row;
+    }
+    data[name] = rows;
+  });
+  return data;
 }
 
 let availableWindLevels = null;